@@ -0,0 +1,208 @@
+import os
+import queue
+import threading
+from datetime import datetime
+from typing import Optional
+from app.database import db
+from auth.models import Conversation, Message
+
+# Most turns a write-behind batch will hold before it is committed
+MAX_BATCH_SIZE = 100
+# How long (seconds) a request waits for the writer to pick up its turn,
+# and then at most once more for a picked-up turn's commit to finish
+COMMIT_TIMEOUT = 10.0
+# Statement timeout (milliseconds) for the writer's transactions, kept below
+# COMMIT_TIMEOUT so a stalled write errors out before requests give up on it
+WRITER_STATEMENT_TIMEOUT_MS = 5000
+
+
+def build_turn_statement(turns):
+    """Build one statement that stores chat turns and touches their conversations.
+
+    Each turn is a (conversation_id, user_content, user_created_at,
+    assistant_content) tuple. All touched conversations are updated by a
+    single UPDATE ... FROM (VALUES ...) CTE on the multi-row message INSERT,
+    so everything goes to Postgres in a single round-trip. Rows are inserted
+    in the order given, which keeps message ids and timestamps ordered
+    within each conversation.
+
+    Postgres does not promise an order for the CTE's row updates, so two
+    writers touching the same conversations can still deadlock. The
+    MessageWriter handles that like any other failed batch, by retrying
+    its turns one by one.
+    """
+    rows = []
+    touched = {}
+    for conversation_id, user_content, user_created_at, assistant_content in turns:
+        now = datetime.utcnow()
+        rows.append({"conversation_id": conversation_id, "content": user_content,
+                     "role": "user", "created_at": user_created_at or now})
+        rows.append({"conversation_id": conversation_id, "content": assistant_content,
+                     "role": "assistant", "created_at": now})
+        touched[conversation_id] = now
+
+    conversations = Conversation.__table__
+    touched_values = db.values(
+        db.column("id", db.Integer), db.column("ts", db.DateTime), name="touched_values"
+    ).data(list(touched.items()))
+    # Setting updated_at explicitly means the ORM onupdate never fires
+    touch = db.update(conversations)\
+              .where(conversations.c.id == touched_values.c.id)\
+              .values(updated_at=touched_values.c.ts)
+    return db.insert(Message.__table__).values(rows)\
+             .returning(Message.__table__.c.id)\
+             .add_cte(touch.cte("touch_conversations"))
+
+
+def save_chat_turn(conversation_id: int, user_content: str, assistant_content: str,
+                   user_created_at: Optional[datetime] = None):
+    """Store a user/assistant message pair and touch the conversation.
+
+    Uses the write-behind writer when it is enabled, otherwise writes and
+    commits on the current session. Returns the ids of the new messages
+    as (user_message_id, assistant_message_id).
+    """
+    if message_writer.enabled:
+        return message_writer.submit(conversation_id, user_content, assistant_content, user_created_at)
+
+    turn = (conversation_id, user_content, user_created_at, assistant_content)
+    result = db.session.execute(build_turn_statement([turn]))
+    ids = _ids_by_turn(result.all(), 1)[0]
+    db.session.commit()
+    return ids
+
+
+def _ids_by_turn(rows, turn_count):
+    # Ids are drawn from the sequence in VALUES order (user, assistant, user,
+    # assistant...), sorting them avoids relying on the order of RETURNING rows
+    ids = sorted(row.id for row in rows)
+    return [(ids[2 * i], ids[2 * i + 1]) for i in range(turn_count)]
+
+
+class _PendingTurn:
+    def __init__(self, turn):
+        self.turn = turn
+        self.done = threading.Event()
+        self.ids = None
+        self.error = None
+        # Set under MessageWriter._state_lock: a turn is either claimed by the
+        # writer (it will be written) or cancelled by a timed out request
+        self.claimed = False
+        self.cancelled = False
+
+
+class MessageWriter:
+    """Write-behind writer that groups chat turns from concurrent requests.
+
+    A background thread drains the queue and commits everything pending in
+    one transaction. Requests block until their turn has been committed, so
+    a response is never sent for a turn that is not durable. If a batch
+    fails, its turns are retried one by one so only the bad turn errors.
+    The queue is FIFO and there is only one writer per process, so
+    per-conversation ordering is the order in which requests submitted
+    their turns.
+
+    The thread is started lazily by the first submit() in each process, so
+    the writer also works under pre-fork servers (e.g. gunicorn --preload).
+    Batching only happens between requests running at the same time in one
+    process: with sync workers that serve one request each, every batch
+    holds a single turn and write-behind gives no benefit.
+    """
+
+    def __init__(self, max_batch_size: int = MAX_BATCH_SIZE):
+        self.max_batch_size = max_batch_size
+        self.enabled = False
+        self.batches_written = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self._app = None
+        self._start_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+
+    def enable(self, app):
+        self._app = app
+        self.enabled = True
+
+    def _ensure_thread(self):
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                # Forked from the process that owned the thread, nothing
+                # queued there will ever be written here
+                self._queue = queue.Queue()
+            if self._pid != os.getpid() or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="message-writer", daemon=True)
+                self._pid = os.getpid()
+                self._thread.start()
+
+    def submit(self, conversation_id: int, user_content: str, assistant_content: str,
+               user_created_at: Optional[datetime] = None):
+        self._ensure_thread()
+        pending = _PendingTurn((conversation_id, user_content, user_created_at, assistant_content))
+        self._queue.put(pending)
+        if not pending.done.wait(COMMIT_TIMEOUT):
+            with self._state_lock:
+                if not pending.claimed:
+                    # The writer will skip it, so a retry cannot store it twice
+                    pending.cancelled = True
+                    raise TimeoutError("Timed out waiting for messages to be saved")
+            # Already being written, the statement timeout bounds how long that takes
+            if not pending.done.wait(COMMIT_TIMEOUT):
+                raise TimeoutError("Timed out waiting for messages to be saved, they may still be stored")
+        if pending.error:
+            raise pending.error
+        return pending.ids
+
+    def _run(self):
+        with self._app.app_context():
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < self.max_batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                self._write(batch)
+
+    def _claim(self, batch):
+        with self._state_lock:
+            claimed = [pending for pending in batch if not pending.cancelled]
+            for pending in claimed:
+                pending.claimed = True
+        return claimed
+
+    def _execute(self, batch):
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {WRITER_STATEMENT_TIMEOUT_MS}")
+            result = connection.execute(build_turn_statement([p.turn for p in batch]))
+            ids = _ids_by_turn(result.all(), len(batch))
+        self.batches_written += 1
+        for pending, turn_ids in zip(batch, ids):
+            pending.ids = turn_ids
+
+    def _write(self, batch):
+        batch = self._claim(batch)
+        if not batch:
+            return
+        try:
+            self._execute(batch)
+        except Exception as e:
+            print(f"Error saving message batch: {e}")
+            if len(batch) == 1:
+                batch[0].error = e
+            else:
+                # Retry one by one so a single bad turn only fails its own request
+                for pending in batch:
+                    try:
+                        self._execute([pending])
+                    except Exception as turn_error:
+                        print(f"Error saving messages for conversation {pending.turn[0]}: {turn_error}")
+                        pending.error = turn_error
+        finally:
+            for pending in batch:
+                pending.done.set()
+
+
+message_writer = MessageWriter()
@@ -0,0 +1,149 @@
+import os
+import re
+import threading
+from collections import Counter
+from typing import List, Optional
+
+# Keywords that point a general-mode message to a specialist tutor.
+# Weight 2 is for words that almost only show up in that subject,
+# weight 1 for words that lean towards it but also have an everyday meaning
+# ("solve", "current", "plate"). Words like "mean" or "word" are left out:
+# they turn up in questions about every subject.
+SUBJECT_KEYWORDS = {
+    "math": {
+        2: ["algebra", "equation", "equations", "fraction", "fractions", "geometry", "trigonometry",
+            "calculus", "derivative", "derivatives", "integral", "integrals", "polynomial", "quadratic",
+            "factorise", "factorize", "simplify", "percentage", "decimal", "decimals", "multiply",
+            "multiplication", "divide", "division", "subtract", "subtraction", "angle", "angles",
+            "triangle", "theorem", "pythagoras", "sin", "cos", "logarithm", "exponent",
+            "exponents", "matrix", "probability", "statistics", "median", "gradient", "parabola",
+            "perimeter", "ratio", "integer", "integers", "math", "maths", "mathematics"],
+        1: ["number", "numbers", "calculate", "x", "y", "function", "formula", "plus", "minus",
+            "solve", "sum", "area", "volume", "graph"],
+    },
+    "english": {
+        2: ["grammar", "essay", "essays", "poem", "poetry", "poet", "novel", "literature", "noun",
+            "nouns", "verb", "verbs", "adjective", "adjectives", "adverb", "pronoun", "tense",
+            "punctuation", "comma", "apostrophe", "spelling", "vocabulary", "synonym", "antonym",
+            "metaphor", "simile", "personification", "alliteration", "shakespeare", "sonnet",
+            "paragraph", "comprehension", "narrative", "english", "sentence", "sentences", "idiom"],
+        1: ["write", "writing", "story", "read", "reading", "character", "theme", "letter", "summary",
+            "book"],
+    },
+    "history": {
+        2: ["history", "historical", "apartheid", "mandela", "war", "wars", "colonial", "colonialism",
+            "colonisation", "empire", "ancient", "civilisation", "civilization", "pharaoh", "treaty",
+            "soweto", "uprising", "democracy", "ww1", "ww2", "hitler", "holocaust", "voortrekkers",
+            "zulu", "shaka", "medieval", "slavery"],
+        1: ["king", "queen", "president", "battle", "government", "freedom", "struggle", "past",
+            "timeline", "source", "sources", "century", "revolution", "independence"],
+    },
+    "geography": {
+        2: ["geography", "map", "maps", "climate", "weather", "continent", "continents", "latitude",
+            "longitude", "erosion", "river", "rivers", "mountain", "mountains", "ecosystem", "biome",
+            "urbanisation", "urbanization", "rainfall", "drought", "plateau", "tectonic", "volcano",
+            "earthquake", "ocean", "oceans", "province", "provinces", "contour", "topographic", "cyclone"],
+        1: ["country", "countries", "city", "cities", "region", "land", "environment", "sustainability",
+            "scale", "water", "plate", "plates", "settlement", "population"],
+    },
+    "physical_science": {
+        2: ["physics", "chemistry", "atom", "atoms", "molecule", "molecules", "electron", "electrons",
+            "proton", "neutron", "periodic", "acid", "acids", "velocity", "acceleration", "momentum",
+            "newton", "newtons", "gravity", "friction", "voltage", "resistance", "circuit", "circuits",
+            "ohm", "magnetism", "frequency", "joule", "electricity", "displacement", "vector"],
+        1: ["force", "forces", "speed", "mass", "heat", "light", "sound", "charge", "power", "pressure",
+            "science", "element", "elements", "compound", "reaction", "reactions", "base", "bases",
+            "current", "magnet", "wave", "waves", "energy", "mole", "moles", "bond", "bonds",
+            "experiment"],
+    },
+}
+
+# Share of the total keyword score the best subject needs before we hand off
+CONFIDENCE_THRESHOLD = 0.6
+# Minimum keyword score for the best subject, one strong keyword is enough
+MIN_SCORE = 2
+# How many earlier student messages a follow-up can inherit its subject from
+FOLLOWUP_LOOKBACK = 3
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Flattened once at import so classifying is a single dict lookup per token
+_KEYWORD_INDEX = {}
+for _subject, _weights in SUBJECT_KEYWORDS.items():
+    for _weight, _words in _weights.items():
+        for _word in _words:
+            _KEYWORD_INDEX.setdefault(_word, []).append((_subject, _weight))
+
+
+class IntentRouter:
+    """Picks a specialist tutor for a general-mode message from its keywords.
+
+    Runs locally (no LLM call) and falls back to "general" when no subject
+    is a clear winner. Follow-ups with no subject keywords of their own
+    ("can you explain step 2 again?") stay with the specialist that the
+    student's recent messages were routed to. Every decision is logged
+    and counted in this process's stats.
+    """
+
+    def __init__(self, threshold: float = CONFIDENCE_THRESHOLD, min_score: int = MIN_SCORE):
+        self.threshold = threshold
+        self.min_score = min_score
+        self._stats = Counter()
+        self._lock = threading.Lock()
+
+    def _score(self, message: str):
+        scores = Counter()
+        for token in _TOKEN_RE.findall(message.lower()):
+            for subject, weight in _KEYWORD_INDEX.get(token, ()):
+                scores[subject] += weight
+        if not scores:
+            return "general", 0, 0.0
+        subject, best = scores.most_common(1)[0]
+        return subject, best, best / sum(scores.values())
+
+    def _decide(self, message: str):
+        # Returns (sub_mode, confidence, best score); confidence is that of the chosen subject
+        subject, best, confidence = self._score(message)
+        if best < self.min_score or confidence < self.threshold:
+            return "general", 0.0, best
+        return subject, confidence, best
+
+    def classify(self, message: str):
+        """Return (sub_mode, confidence) for a message, confidence is 0 for "general"."""
+        sub_mode, confidence, _ = self._decide(message)
+        return sub_mode, confidence
+
+    def route(self, message: str, previous_messages: Optional[List[str]] = None) -> str:
+        """Pick the sub_mode for a message.
+
+        previous_messages are the student's earlier messages in the
+        conversation, oldest first. They are only consulted when the
+        message itself has too little subject signal to route.
+        """
+        sub_mode, confidence, best = self._decide(message)
+        followup = False
+        # Messages split between subjects stay general, only keyword-less ones follow up
+        if best < self.min_score:
+            for previous in reversed((previous_messages or [])[-FOLLOWUP_LOOKBACK:]):
+                previous_mode, previous_confidence = self.classify(previous)
+                if previous_mode != "general":
+                    sub_mode, confidence, followup = previous_mode, previous_confidence, True
+                    break
+
+        with self._lock:
+            self._stats["total"] += 1
+            self._stats[sub_mode] += 1
+            if followup:
+                self._stats["followup"] += 1
+        # Stats are per process, the log line is what can be aggregated across workers
+        print(f"Intent router [pid {os.getpid()}]: routed to {sub_mode} "
+              f"(confidence {confidence:.2f}, followup {followup})")
+        return sub_mode
+
+    def stats(self) -> dict:
+        """Routing counts for this process only."""
+        with self._lock:
+            return dict(self._stats)
+
+
+intent_router = IntentRouter()
@@ -9,6 +9,8 @@ from app.database import db
 import re
 from typing import List, Dict, Optional
 from auth.models import User
+from app.router import intent_router
+from app.persistence import save_chat_turn
 
 load_dotenv()
 
@@ -111,7 +113,8 @@ general_tutor_agent = Agent(
         "😊 Add emojis where useful to make learning more interactive and friendly.\n"
         "🧠 Always check in if the student is understanding, and offer encouragement and support.\n"
         "\n"
-        "If the question requires subject-specific expertise, kindly suggest they talk to a specialist agent (like the Math or English helper)."
+        "Questions that clearly belong to one subject are passed to a specialist tutor within this same conversation, "
+        "so answer everything you receive yourself and never ask the student to start a new conversation."
     )
 )
 
@@ -232,6 +235,7 @@ def process_with_agents(user_message: str, conversation: Conversation, user: Use
     
     try:
         # Determine which agent to use
+        sub_mode = conversation.sub_mode
         if conversation.mode == "tutor":
             agent_map = {
                 "math": math_agent,
@@ -241,7 +245,11 @@ def process_with_agents(user_message: str, conversation: Conversation, user: Use
                 "geography": geography_agent,
                 "physical_science": physical_science_agent
             }
-            agent = agent_map.get(conversation.sub_mode, general_tutor_agent)
+            # General conversations hand subject questions to the matching specialist
+            if sub_mode == "general":
+                previous = [msg["content"] for msg in messages[:-1] if msg["role"] == "user"]
+                sub_mode = intent_router.route(user_message, previous)
+            agent = agent_map.get(sub_mode, general_tutor_agent)
         else:
             agent = study_tips_agent
             
@@ -255,7 +263,7 @@ def process_with_agents(user_message: str, conversation: Conversation, user: Use
         content = agent.generate_response(messages[1:])
         
         # For math and science, verify the response
-        if conversation.mode == "tutor" and conversation.sub_mode in ["math", "physical_science"]:
+        if conversation.mode == "tutor" and sub_mode in ["math", "physical_science"]:
             verification_prompt = (
                 "Please verify and correct ONLY the mathematical/scientific expressions in the following text. "
                 "Do not change any other part of the response. "
@@ -269,7 +277,7 @@ def process_with_agents(user_message: str, conversation: Conversation, user: Use
             )
             content = verified_content
 
-        if conversation.mode == "tutor" and conversation.sub_mode == "math" or conversation.sub_mode == "physical_science":
+        if conversation.mode == "tutor" and sub_mode == "math" or sub_mode == "physical_science":
             content = format_response(content)
 
         return content
@@ -449,28 +457,13 @@ def chat(conversation_id):
         return jsonify({"error": "No message provided"}), 400
     
     try:
-        # Save user message
-        user_msg = Message(
-            conversation_id=conversation_id,
-            content=user_message,
-            role="user",
-            created_at=datetime.utcnow()
-        )
-        db.session.add(user_msg)
+        user_message_at = datetime.utcnow()
         
         # Process with agent pipeline - pass user object
         ai_response = process_with_agents(user_message, conversation, user)
         
-        # Save AI response
-        ai_msg = Message(
-            conversation_id=conversation_id,
-            content=ai_response,
-            role="assistant",
-            created_at=datetime.utcnow()
-        )
-        db.session.add(ai_msg)
-        conversation.updated_at = datetime.utcnow()
-        db.session.commit()
+        # Save both messages and touch the conversation in one round-trip
+        save_chat_turn(conversation_id, user_message, ai_response, user_created_at=user_message_at)
         
         return jsonify({
             "response": ai_response,
@@ -0,0 +1,99 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.database import db
+from .models import TokenBlocklist
+
+# How often (seconds) each worker pulls newly revoked JTIs from the database.
+# This bounds how long a revoked token can still be accepted by other workers.
+SYNC_INTERVAL = 2.0
+# Each sync re-reads rows created slightly before the previous one so that
+# revocations committed late by another worker are not skipped.
+SYNC_OVERLAP = timedelta(seconds=30)
+# How often (seconds) a worker deletes blocklist rows for expired tokens
+PURGE_INTERVAL = 3600.0
+
+
+class RevokedTokenCache:
+    """Per-process copy of the token blocklist.
+
+    Revocations are persisted in the token_blocklist table and every worker
+    keeps the unexpired JTIs in a dict, so checking a token on each request
+    is a plain in-memory lookup. The dict is refreshed incrementally by
+    fetching only rows created since the previous sync, at most once every
+    SYNC_INTERVAL seconds. The sync watermark comes from the database clock,
+    the same clock that stamps created_at, so worker clock skew is harmless.
+    """
+
+    def __init__(self, sync_interval: float = SYNC_INTERVAL):
+        self.sync_interval = sync_interval
+        self._revoked = {}  # jti -> expires_at
+        self._synced_at = None
+        self._next_sync = 0.0
+        self._next_purge = time.monotonic() + PURGE_INTERVAL
+        self._lock = threading.Lock()
+
+    def is_revoked(self, jti: str) -> bool:
+        if time.monotonic() >= self._next_sync:
+            self.sync()
+        return jti in self._revoked
+
+    def revoke(self, jti: str, expires_at: datetime):
+        """Persist a revocation and apply it to this worker straight away."""
+        # Another worker may have revoked the same token before this one synced
+        db.session.execute(
+            pg_insert(TokenBlocklist.__table__)
+            .values(jti=jti, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=["jti"])
+        )
+        db.session.commit()
+        # sync() rebuilds the dict under the lock, so wait for it to finish
+        with self._lock:
+            self._revoked[jti] = expires_at
+
+    def sync(self):
+        # Only one thread per worker does the refresh, the rest keep using
+        # the current dict instead of queueing up behind the query.
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            now = datetime.utcnow()
+            db_now = db.session.query(db.cast(db.func.current_timestamp(), db.DateTime)).scalar()
+            query = db.session.query(
+                TokenBlocklist.jti, TokenBlocklist.expires_at
+            ).filter(TokenBlocklist.expires_at > now)
+            if self._synced_at is not None:
+                query = query.filter(TokenBlocklist.created_at > self._synced_at - SYNC_OVERLAP)
+
+            revoked = {
+                jti: expires_at for jti, expires_at in self._revoked.items()
+                if expires_at > now  # Expired tokens are rejected by JWT validation anyway
+            }
+            for jti, expires_at in query.all():
+                revoked[jti] = expires_at
+            self._revoked = revoked
+            self._synced_at = db_now
+
+            if time.monotonic() >= self._next_purge:
+                self._next_purge = time.monotonic() + PURGE_INTERVAL
+                purge_expired_tokens()
+        except Exception as e:
+            db.session.rollback()
+            # Keep serving from the current dict and try again after the interval
+            print(f"Error syncing token blocklist: {e}")
+        finally:
+            self._next_sync = time.monotonic() + self.sync_interval
+            self._lock.release()
+
+
+revoked_tokens = RevokedTokenCache()
+
+
+def purge_expired_tokens():
+    """Delete blocklist rows whose tokens have expired."""
+    deleted = TokenBlocklist.query.filter(
+        TokenBlocklist.expires_at <= datetime.utcnow()
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
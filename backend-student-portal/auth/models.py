@@ -37,4 +37,11 @@ class Message(db.Model):
     content = db.Column(db.Text, nullable=False)
     role = db.Column(db.String(20), nullable=False)  # 'user', 'assistant', or 'system'
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    tokens = db.Column(db.Integer)  # Optional
\ No newline at end of file
+    tokens = db.Column(db.Integer)  # Optional
+
+class TokenBlocklist(db.Model):
+    __tablename__ = 'token_blocklist'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    jti = db.Column(db.String(36), nullable=False, unique=True, index=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # Token's own exp, rows are useless after this
+    created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp(), index=True)
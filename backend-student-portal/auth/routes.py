@@ -4,6 +4,8 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager 
 from .models import User  # Import the User model from the models module
 from app.database import db  # Import the shared SQLAlchemy instance
+from .blocklist import revoked_tokens
+from datetime import datetime
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -90,7 +92,9 @@ def get_user():
 @jwt_required()
 def logout():
     
-    jti = get_jwt()['jti']
+    token = get_jwt()
+    # Keep the blocklist entry only as long as the token itself would be valid
+    revoked_tokens.revoke(token['jti'], datetime.utcfromtimestamp(token['exp']))
 
     response = jsonify({"msg": "Successfully logged out"})
     unset_jwt_cookies(response)
@@ -0,0 +1,69 @@
+"""Check and benchmark the local intent router used by general-mode tutoring.
+
+Usage: python bench_intent_router.py [iterations]
+
+Routes a table of labelled student messages, including everyday phrasing
+that must stay with the general tutor, then times the classifier on a long
+message. Exits non-zero if any message is misrouted or a route takes
+longer than a millisecond.
+"""
+import sys
+import timeit
+from app.router import IntentRouter
+
+# (message, previous student messages, expected sub_mode)
+EXAMPLES = [
+    ("How do I solve the quadratic equation x^2+3x+2=0?", [], "math"),
+    ("Calculate the area of a triangle", [], "math"),
+    ("Can you help me solve for x?", [], "math"),
+    ("Can you help me with my essay on Romeo and Juliet's themes", [], "english"),
+    ("What does metaphor mean?", [], "english"),
+    ("What caused the Soweto uprising in 1976?", [], "history"),
+    ("What does the word apartheid mean?", [], "history"),
+    ("Explain how rainfall and erosion shape river valleys", [], "geography"),
+    ("What is Newton's second law and acceleration?", [], "physical_science"),
+    ("How does current flow through a series circuit?", [], "physical_science"),
+    ("hi how are you", [], "general"),
+    ("what is the best way to learn?", [], "general"),
+    ("What does this word mean?", [], "general"),
+    ("Can you help me solve my problem with my friend?", [], "general"),
+    ("What does x mean in this sentence?", [], "english"),
+    ("Should I go with the current plan or change it?", [], "general"),
+    ("Can you put the plate on the table?", [], "general"),
+    ("What is the base of my argument?", [], "general"),
+    # Follow-ups stay with the specialist the conversation was routed to
+    ("Can you explain step 2 again?", ["How do I factorise a quadratic equation?"], "math"),
+    ("Thanks! Can you give me another example?", ["What is a simile?", "hi"], "english"),
+    ("Can you explain step 2 again?", ["hi how are you"], "general"),
+]
+
+LONG_MESSAGE = (
+    "Can you help me understand how to calculate the velocity of a car that accelerates with "
+    "constant acceleration over a distance of 100 metres, and also what the formula means? "
+) * 3
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    router = IntentRouter()
+
+    failures = 0
+    for message, previous, expected in EXAMPLES:
+        routed = router.route(message, previous)
+        if routed != expected:
+            failures += 1
+            print(f"MISROUTED {message!r}: expected {expected}, got {routed}")
+    print(f"{len(EXAMPLES) - failures}/{len(EXAMPLES)} examples routed correctly")
+    print(f"Routing stats: {router.stats()}")
+
+    # Time the routing decision itself, route() also prints a log line per call
+    elapsed = timeit.timeit(lambda: router.classify(LONG_MESSAGE), number=iterations)
+    per_route_ms = elapsed / iterations * 1000
+    print(f"classify(): {per_route_ms * 1000:.1f} us per {len(LONG_MESSAGE)}-character message")
+
+    if failures or per_route_ms >= 1:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark chat turn persistence against the database in DATABASE_URI.
+
+Usage: python bench_message_writes.py <conversation_id> [turns_per_thread]
+
+Writes user/assistant message pairs into an existing conversation from
+1, 4, 16 and 64 threads, first with a commit per turn and then through
+the write-behind writer, and prints turns/sec and commits/sec for each.
+The benchmark messages are deleted afterwards.
+"""
+import sys
+import threading
+import time
+from main import app
+from app.database import db
+from app.persistence import save_chat_turn, message_writer
+from auth.models import Message
+
+CONCURRENCY_LEVELS = [1, 4, 16, 64]
+MARKER = "[bench_message_writes]"
+
+
+def run(conversation_id, threads, turns_per_thread):
+    def worker():
+        with app.app_context():
+            for _ in range(turns_per_thread):
+                save_chat_turn(conversation_id, MARKER, MARKER)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - start
+
+
+def main():
+    conversation_id = int(sys.argv[1])
+    turns_per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    for mode in ["per-turn", "write-behind"]:
+        if mode == "write-behind":
+            message_writer.enable(app)
+        else:
+            # MESSAGE_WRITE_BEHIND may already have enabled it when main was imported
+            message_writer.enabled = False
+        for threads in CONCURRENCY_LEVELS:
+            batches_before = message_writer.batches_written
+            elapsed = run(conversation_id, threads, turns_per_thread)
+            turns = threads * turns_per_thread
+            commits = message_writer.batches_written - batches_before if mode == "write-behind" else turns
+            print(f"{mode:>12} threads={threads:<3} turns/sec={turns / elapsed:8.1f} "
+                  f"commits/sec={commits / elapsed:8.1f}")
+
+    with app.app_context():
+        Message.query.filter_by(conversation_id=conversation_id, content=MARKER).delete()
+        db.session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from flask_jwt_extended import JWTManager, jwt_required, get_jwt_identity
 from dotenv import load_dotenv
 import os
 from datetime import timedelta
+from auth.blocklist import revoked_tokens
 
 # Load environment variables from .env file
 load_dotenv()
@@ -37,6 +38,11 @@ def create_app():
     
     jwt = JWTManager(app)  # Initialize JWTManager
 
+    # Reject revoked tokens using the in-memory blocklist (no DB query per request)
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(jwt_header, jwt_payload):
+        return revoked_tokens.is_revoked(jwt_payload['jti'])
+
     # Initialize database
     db.init_app(app)
 
@@ -59,6 +65,11 @@ def create_app():
         except Exception as e:
             print(f"❌ ERROR: Could not check registered models! Error: {str(e)}")
 
+    # Optionally group message commits from concurrent chat requests
+    if os.getenv("MESSAGE_WRITE_BEHIND", "false").lower() in ("1", "true", "yes"):
+        from app.persistence import message_writer
+        message_writer.enable(app)
+
     # Import blueprints AFTER initializing db
     from app.routes import chat_bp
     from auth.routes import auth_bp